@@ -0,0 +1,77 @@
+"""Замер времени запуска персонального помощника.
+
+Создаёт во временном каталоге файлы с RECORDS записями каждого типа и в отдельных
+процессах измеряет: импорт модуля, создание приложения, первую страницу списка
+задач без снимка данных (холодный старт) и со снимком (тёплый старт).
+
+Запуск: python benchmark_startup.py [RECORDS]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CHILD_CODE = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {module_dir!r})
+import personal_assistant
+imported = time.perf_counter()
+app = personal_assistant.PersonalAssistantApp(snapshots=True)
+created = time.perf_counter()
+page = app.query_engine.query('type:task done:false sort:due')
+queried = time.perf_counter()
+app.save_snapshot()
+print(imported - start, created - imported, queried - created)
+"""
+
+
+def write_datasets(directory, records):
+    datasets = {
+        'notes.json': [
+            {'id': i, 'title': f'Заметка {i}', 'content': 'Текст ' * 10, 'timestamp': '01-01-2026 12:00:00'}
+            for i in range(1, records + 1)
+        ],
+        'tasks.json': [
+            {'id': i, 'title': f'Задача {i}', 'description': 'Описание', 'done': i % 3 == 0,
+             'priority': 'Средний', 'due_date': f'{i % 28 + 1:02d}-{i % 12 + 1:02d}-2026'}
+            for i in range(1, records + 1)
+        ],
+        'contacts.json': [
+            {'id': i, 'name': f'Контакт {i}', 'phone': f'+7900{i:07d}', 'email': f'user{i}@example.com'}
+            for i in range(1, records + 1)
+        ],
+        'finance.json': [
+            {'id': i, 'amount': (i % 200) - 100.0, 'category': 'Еда', 'date': '15-06-2026',
+             'description': 'Покупка'}
+            for i in range(1, records + 1)
+        ]
+    }
+    for file_name, content in datasets.items():
+        with open(os.path.join(directory, file_name), 'w', encoding='utf-8') as file:
+            json.dump(content, file, ensure_ascii=False, indent=4)
+
+
+def run_child(directory):
+    output = subprocess.run([sys.executable, '-c', CHILD_CODE.format(module_dir=MODULE_DIR)],
+                            cwd=directory, capture_output=True, text=True, check=True).stdout
+    return [float(value) * 1000 for value in output.split()]
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_datasets(directory, records)
+        print(f"Записей каждого типа: {records}")
+        for label in ("Холодный старт", "Тёплый старт (снимок)"):
+            import_ms, create_ms, query_ms = run_child(directory)
+            print(f"{label}: импорт {import_ms:.1f} мс | приложение {create_ms:.2f} мс | "
+                  f"первая страница {query_ms:.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,39 @@
+# csv, datetime и прочие модули, нужные не при каждом запуске, импортируются там,
+# где используются: так старт приложения не платит за то, что может не понадобиться.
 import json
-import csv
-from datetime import datetime
+import operator
 import os
+import re
+from functools import cached_property
 
 NOTES_FILE = 'notes.json'
 TASKS_FILE = 'tasks.json'
 CONTACTS_FILE = 'contacts.json'
 FINANCE_FILE = 'finance.json'
+SNAPSHOT_SUFFIX = '.snapshot'
+SNAPSHOT_VERSION = 2
+# Тёплые снимки данных выключены по умолчанию; PERSONAL_ASSISTANT_SNAPSHOTS=1 включает их.
+# Снимки — pickle-файлы, которые читаются из рабочего каталога рядом с файлами данных,
+# поэтому включать их можно только в каталогах, содержимому которых вы доверяете.
+SNAPSHOTS_ENV = 'PERSONAL_ASSISTANT_SNAPSHOTS'
 
 
-def create_files_if_not_exist():
-    files = {
-        NOTES_FILE: [],
-        TASKS_FILE: [],
-        CONTACTS_FILE: [],
-        FINANCE_FILE: []
-    }
+def create_file_if_not_exist(file_name):
+    if not os.path.isfile(file_name):
+        with open(file_name, 'w', encoding='utf-8') as file:
+            json.dump([], file, ensure_ascii=False, indent=4)
+        print(f"Создан файл: {file_name}")
 
-    for file_name, default_content in files.items():
-        if not os.path.isfile(file_name):
-            with open(file_name, 'w', encoding='utf-8') as file:
-                json.dump(default_content, file, ensure_ascii=False, indent=4)
-            print(f"Создан файл: {file_name}")
+
+def read_objects_from_json_file(filename, instance):
+    with open(filename, 'r', encoding='utf-8') as file:
+        results = json.load(file)
+        return [instance(**result) for result in results]
 
 
 def get_objects_by_json_file(filename, instance):
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            results = json.load(file)
-            return [instance(**result) for result in results]
+        return read_objects_from_json_file(filename, instance)
     except FileNotFoundError:
         return []
     except json.JSONDecodeError:
@@ -44,6 +49,8 @@ class Note:
         if timestamp:
             self.timestamp = timestamp
         else:
+            from datetime import datetime
+
             self.timestamp = datetime.now().strftime('%d-%m-%Y %H:%M:%S')
 
     def to_dict(self):
@@ -54,6 +61,9 @@ class Note:
             'timestamp': self.timestamp
         }
 
+    def __str__(self):
+        return f"{self.id}: {self.title} (Создано: {self.timestamp})"
+
 
 class NoteManager:
     def __init__(self, filename: str):
@@ -74,14 +84,6 @@ class NoteManager:
         self.save_notes(notes)
         print("Заметка успешно добавлена!")
 
-    def view_notes(self):
-        notes = self.load_notes()
-        if not notes:
-            print("Нет доступных заметок.")
-            return
-        for note in notes:
-            print(f"{note.id}: {note.title} (Создано: {note.timestamp})")
-
     def view_note_details(self, note_id: int):
         notes = self.load_notes()
         note = next((n for n in notes if n.id == note_id), None)
@@ -94,6 +96,8 @@ class NoteManager:
         notes = self.load_notes()
         note = next((n for n in notes if n.id == note_id), None)
         if note:
+            from datetime import datetime
+
             note.title = title
             note.content = content
             note.timestamp = datetime.now().strftime('%d-%m-%Y %H:%M:%S')
@@ -109,6 +113,8 @@ class NoteManager:
         print("Заметка успешно удалена!")
 
     def export_notes_to_csv(self):
+        import csv
+
         notes = self.load_notes()
         with open('notes_export.csv', 'w', newline='', encoding='utf-8') as csvfile:
             fieldnames = ['id', 'title', 'content', 'timestamp']
@@ -121,6 +127,8 @@ class NoteManager:
         print("Заметки успешно экспортированы в notes_export.csv!")
 
     def import_notes_from_csv(self):
+        import csv
+
         with open(input("Введите имя CSV-файла для импорта: "), newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
             notes = self.load_notes()
@@ -154,6 +162,10 @@ class Task:
             'due_date': self.due_date
         }
 
+    def __str__(self):
+        status = "Выполнена" if self.done else "Не выполнена"
+        return f"{self.id}: {self.title} | Статус: {status} | Приоритет: {self.priority} | Срок: {self.due_date}"
+
 
 class TaskManager:
     def __init__(self, filename: str):
@@ -174,15 +186,6 @@ class TaskManager:
         self.save_tasks(tasks)
         print("Задача успешно добавлена!")
 
-    def view_tasks(self):
-        tasks = self.load_tasks()
-        if not tasks:
-            print("Нет доступных задач.")
-            return
-        for task in tasks:
-            status = "Выполнена" if task.done else "Не выполнена"
-            print(f"{task.id}: {task.title} | Статус: {status} | Приоритет: {task.priority} | Срок: {task.due_date}")
-
     def mark_task_as_done(self, task_id: int):
         tasks = self.load_tasks()
         task = next((t for t in tasks if t.id == task_id), None)
@@ -213,6 +216,8 @@ class TaskManager:
         print("Задача успешно удалена!")
 
     def export_tasks_to_csv(self):
+        import csv
+
         tasks = self.load_tasks()
         with open('tasks_export.csv', 'w', newline='', encoding='utf-8') as csvfile:
             fieldnames = ['id', 'title', 'description', 'done', 'priority', 'due_date']
@@ -225,6 +230,8 @@ class TaskManager:
         print("Задачи успешно экспортированы в tasks_export.csv!")
 
     def import_tasks_from_csv(self):
+        import csv
+
         with open(input("Введите имя CSV-файла для импорта: "), newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
             tasks = self.load_tasks()
@@ -254,6 +261,9 @@ class Contact:
             'email': self.email
         }
 
+    def __str__(self):
+        return f"{self.id}: {self.name} | Телефон: {self.phone} | Email: {self.email}"
+
 
 class ContactManager:
     def __init__(self, filename: str):
@@ -274,17 +284,6 @@ class ContactManager:
         self.save_contacts(contacts)
         print("Контакт успешно добавлен!")
 
-    def search_contact(self, query: str):
-        contacts = self.load_contacts()
-        found_contacts = [c for c in contacts if query.lower() in c.name.lower() or query in c.phone]
-
-        if not found_contacts:
-            print("Контакты не найдены.")
-            return
-
-        for contact in found_contacts:
-            print(f"{contact.id}: {contact.name} | Телефон: {contact.phone} | Email: {contact.email}")
-
     def edit_contact(self, contact_id: int, name: str, phone: str, email: str):
         contacts = self.load_contacts()
         contact = next((c for c in contacts if c.id == contact_id), None)
@@ -305,6 +304,8 @@ class ContactManager:
         print("Контакт успешно удалён!")
 
     def export_contacts_to_csv(self):
+        import csv
+
         contacts = self.load_contacts()
 
         with open('contacts_export.csv', 'w', newline='', encoding='utf-8') as csvfile:
@@ -318,6 +319,8 @@ class ContactManager:
         print("Контакты успешно экспортированы в contacts_export.csv!")
 
     def import_contacts_from_csv(self):
+        import csv
+
         with open(input("Введите имя CSV-файла для импорта: "), newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
             contacts = self.load_contacts()
@@ -348,6 +351,10 @@ class FinanceRecord:
             'description': self.description
         }
 
+    def __str__(self):
+        return (f"{self.id}: {self.amount} | Категория: {self.category} | Дата: {self.date}"
+                f" | Описание: {self.description}")
+
 
 class FinanceManager:
     def __init__(self, filename: str):
@@ -368,18 +375,9 @@ class FinanceManager:
         self.save_records(records)
         print("Финансовая запись успешно добавлена!")
 
-    def view_records(self):
-        records = self.load_records()
-        if not records:
-            print("Нет доступных финансовых записей.")
-            return
-
-        for record in records:
-            print(
-                f"{record.id}: {record.amount} | Категория: {record.category}\
-| Дата: {record.date} | Описание: {record.description}")
-
     def filter_records(self, category=None, start_date=None, end_date=None):
+        from datetime import datetime
+
         records = self.load_records()
 
         if category:
@@ -407,6 +405,8 @@ class FinanceManager:
         print(f"Баланс: {total_income + total_expenses:.2f}")
 
     def export_records_to_csv(self):
+        import csv
+
         records = self.load_records()
 
         with open('finance_export.csv', 'w', newline='', encoding='utf-8') as csvfile:
@@ -420,6 +420,8 @@ class FinanceManager:
         print("Финансовые записи успешно экспортированы в finance_export.csv!")
 
     def import_records_from_csv(self):
+        import csv
+
         with open(input("Введите имя CSV-файла для импорта: "), newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
             records = self.load_records()
@@ -434,12 +436,584 @@ class FinanceManager:
         print("Финансовые записи успешно импортированы из CSV-файла.")
 
 
+ENTITY_TYPES = {
+    'note': (NOTES_FILE, Note),
+    'task': (TASKS_FILE, Task),
+    'contact': (CONTACTS_FILE, Contact),
+    'finance': (FINANCE_FILE, FinanceRecord)
+}
+
+# Поля, по которым строятся индексы равенства (в памяти, при первом использовании).
+INDEXED_FIELDS = {
+    'note': ('id',),
+    'task': ('id', 'done', 'priority'),
+    'contact': ('id', 'name'),
+    'finance': ('id', 'category')
+}
+
+QUERY_PAGE_SIZE = 20
+# Индекс равенства используется, только если отбирает не больше 1/INDEX_SELECTIVITY записей;
+# иначе дешевле идти по сортированному индексу от ключа курсора.
+INDEX_SELECTIVITY = 10
+QUERY_TOKEN = re.compile(r'^(\w+)(<=|>=|!=|<|>|=|:)(.*)$')
+QUERY_COMPARISONS = {
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge
+}
+FIELD_ALIASES = {'due': 'due_date'}
+DATE_FIELDS = {'due_date', 'date', 'timestamp'}
+# Длина нормализованной даты без времени: ГГГГ-ММ-ДД.
+DAY_LENGTH = 10
+NUMBER_FIELDS = {'id', 'amount'}
+BOOL_FIELDS = {'done'}
+TRUE_LITERALS = {'true', 'yes', 'да', '1'}
+FALSE_LITERALS = {'false', 'no', 'нет', '0'}
+# Имя столбца со всем текстом записи; не может совпасть с именем поля в запросе.
+TEXT_COLUMN = '*'
+
+
+def normalize_date_value(value, datetime):
+    for date_format in ('%d-%m-%Y %H:%M:%S', '%d-%m-%Y'):
+        try:
+            return datetime.strptime(str(value), date_format).strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            pass
+    return None
+
+
+def normalize_bool_value(value):
+    if isinstance(value, str):
+        if value.lower() in TRUE_LITERALS:
+            return 1
+        if value.lower() in FALSE_LITERALS:
+            return 0
+        return None
+    return int(bool(value))
+
+
+def normalize_number_value(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def field_normalizer(field):
+    """Возвращает функцию, приводящую значения поля к виду для сравнения и сортировки.
+
+    Даты превращаются в строки ГГГГ-ММ-ДД ЧЧ:ММ:СС, флаги в 0/1, числа в float,
+    остальное в строку в нижнем регистре. Для нераспознанных значений и None функция
+    возвращает None. Модуль datetime импортируется один раз на столбец, а не на запись.
+    """
+    if field in DATE_FIELDS:
+        from datetime import datetime
+
+        return lambda value: None if value is None else normalize_date_value(value, datetime)
+    if field in BOOL_FIELDS:
+        return lambda value: None if value is None else normalize_bool_value(value)
+    if field in NUMBER_FIELDS:
+        return lambda value: None if value is None else normalize_number_value(value)
+    return lambda value: None if value is None else str(value).lower()
+
+
+class Query:
+    def __init__(self, types, filters, words, sort_field=None, descending=False):
+        self.types = types
+        self.filters = filters
+        self.words = words
+        self.sort_field = sort_field
+        self.descending = descending
+
+    def fields(self):
+        fields = {'id'}
+        fields.update(field for field, _, _ in self.filters)
+        if self.sort_field:
+            fields.add(self.sort_field)
+        if self.words:
+            fields.add(TEXT_COLUMN)
+        return fields
+
+    def matches(self, position, columns):
+        for field, op, expected in self.filters:
+            actual = columns[field][position]
+            if actual is None:
+                return False
+            if field in DATE_FIELDS and (op == ':' or len(expected) == DAY_LENGTH):
+                # Граница без времени сравнивается с датой записи целиком, по дням.
+                actual, expected = actual[:DAY_LENGTH], expected[:DAY_LENGTH]
+            if op == ':':
+                if isinstance(actual, str) and field not in DATE_FIELDS:
+                    matched = expected in actual
+                else:
+                    matched = actual == expected
+            else:
+                matched = QUERY_COMPARISONS[op](actual, expected)
+            if not matched:
+                return False
+
+        if self.words:
+            text = columns[TEXT_COLUMN][position]
+            return all(word in text for word in self.words)
+        return True
+
+    def is_valid_sort_key(self, key):
+        """Проверяет, что ключ из курсора сравним с ключами, которые строит sort_key."""
+        if len(key) != 5:
+            return False
+        flag, value, entity_type, record_id, position = key
+        if type(flag) is not int or flag not in (0, 1) or type(position) is not int:
+            return False
+        if not isinstance(entity_type, str) or entity_type not in ENTITY_TYPES:
+            return False
+        if isinstance(record_id, bool) or not isinstance(record_id, (int, float)):
+            return False
+
+        missing = flag == (0 if self.descending else 1)
+        if missing or not self.sort_field:
+            return value == ''
+        if self.sort_field in NUMBER_FIELDS | BOOL_FIELDS:
+            return not isinstance(value, bool) and isinstance(value, (int, float))
+        return isinstance(value, str)
+
+    def sort_key(self, entity_type, position, columns):
+        value = columns[self.sort_field][position] if self.sort_field else ''
+        # Записи без значения поля сортировки всегда идут в конце страницы.
+        if self.descending:
+            flag = int(value is not None)
+        else:
+            flag = int(value is None)
+        return flag, '' if value is None else value, entity_type, columns['id'][position], position
+
+
+def parse_query(text: str):
+    """Разбирает строку запроса вида `type:task done:false due<01-12-2026 sort:due`.
+
+    Поддерживаются условия `поле:значение` (подстрока для текста, равенство для
+    остального), `=`, `!=`, `<`, `<=`, `>`, `>=`, `type:` со списком типов через
+    запятую, `sort:поле` или `sort:-поле` и произвольные слова для поиска по тексту.
+    """
+    import shlex
+
+    types = set()
+    filters = []
+    words = []
+    sort_field = None
+    descending = False
+
+    for token in shlex.split(text):
+        match = QUERY_TOKEN.match(token)
+        if not match:
+            words.append(token.lower())
+            continue
+
+        field, op, value = match.groups()
+        field = FIELD_ALIASES.get(field, field)
+        if field == 'type' and op == ':':
+            for entity_type in value.split(','):
+                if entity_type not in ENTITY_TYPES:
+                    raise ValueError(f"неизвестный тип записей: {entity_type}")
+                types.add(entity_type)
+        elif field == 'sort' and op == ':':
+            descending = value.startswith('-')
+            sort_field = value.lstrip('-')
+            sort_field = FIELD_ALIASES.get(sort_field, sort_field)
+        else:
+            expected = field_normalizer(field)(value)
+            if expected is None:
+                raise ValueError(f"некорректное значение для поля {field}: {value}")
+            if field in DATE_FIELDS and ' ' not in value.strip():
+                expected = expected[:DAY_LENGTH]
+            filters.append((field, op, expected))
+
+    return Query(sorted(types) or list(ENTITY_TYPES), filters, words, sort_field, descending)
+
+
+def as_query(text):
+    """Разбирает строку запроса; готовый Query (например, с дословными словами поиска) возвращает как есть."""
+    return text if isinstance(text, Query) else parse_query(text)
+
+
+def encode_cursor(query, key):
+    import base64
+
+    payload = json.dumps({'sort': [query.sort_field, query.descending], 'after': key}, ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(query, cursor):
+    import base64
+    import binascii
+
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        key = tuple(payload['after'])
+        sort = payload['sort']
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError):
+        raise ValueError("некорректный курсор")
+    if sort != [query.sort_field, query.descending]:
+        raise ValueError("курсор относится к другому запросу")
+    if not query.is_valid_sort_key(key):
+        raise ValueError("некорректный курсор")
+    return key
+
+
+class QueryPage:
+    def __init__(self, items, next_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+
+class SnapshotRecords:
+    """Записи из снимка: хранятся кортежами значений, объекты создаются при обращении."""
+
+    def __init__(self, instance, fields, rows):
+        self.instance = instance
+        self.fields = fields
+        self.rows = rows
+        self._records = [None] * len(rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, position):
+        record = self._records[position]
+        if record is None:
+            record = self.instance(**dict(zip(self.fields, self.rows[position])))
+            self._records[position] = record
+        return record
+
+    def __iter__(self):
+        for position in range(len(self.rows)):
+            yield self[position]
+
+
+class QueryEngine:
+    """Запросы по всем типам записей с постраничной выдачей.
+
+    Данные каждого файла, нормализованные столбцы значений полей, индексы равенства
+    и сортированные индексы загружаются при первом обращении и держатся в памяти,
+    пока файл не изменится. При `snapshots=True` всё это сохраняется рядом с файлом
+    данных и при следующем запуске берётся из снимка, если время изменения и размер
+    файла совпадают с сохранёнными. Страница начинается с поиска ключа курсора
+    в сортированном индексе, поэтому каждая следующая страница не дороже первой.
+    """
+
+    def __init__(self, sources=None, snapshots: bool = False):
+        self.sources = sources or ENTITY_TYPES
+        self.snapshots = snapshots
+        self._datasets = {}
+        self._changed = set()
+
+    def _snapshot_file(self, entity_type):
+        return self.sources[entity_type][0] + SNAPSHOT_SUFFIX
+
+    def _read_snapshot(self, entity_type):
+        snapshot_file = self._snapshot_file(entity_type)
+        if not self.snapshots or not os.path.isfile(snapshot_file):
+            return None
+
+        import pickle
+
+        # Повреждённый, неполный или несовместимый снимок просто пересобирается из JSON.
+        try:
+            with open(snapshot_file, 'rb') as file:
+                snapshot = pickle.load(file)
+            if snapshot['version'] != SNAPSHOT_VERSION:
+                return None
+
+            signature, fields, rows = snapshot['signature'], tuple(snapshot['fields']), snapshot['rows']
+            columns, indexes, sorted_keys = snapshot['columns'], snapshot['indexes'], snapshot['sorted']
+            record_count = len(rows)
+            consistent = (
+                all(len(row) == len(fields) for row in rows)
+                and all(len(column) == record_count for column in columns.values())
+                and all(0 <= position < record_count
+                        for index in indexes.values() for positions in index.values() for position in positions)
+                and all(len(keys) == record_count for keys in sorted_keys.values())
+            )
+        except Exception:
+            return None
+        if not consistent:
+            return None
+
+        _, instance = self.sources[entity_type]
+        return {
+            'signature': signature,
+            'valid': True,
+            'records': SnapshotRecords(instance, fields, rows),
+            'columns': columns,
+            'indexes': indexes,
+            'sorted': sorted_keys
+        }
+
+    def _mark_changed(self, entity_type, dataset):
+        # Данные из файла, который не удалось разобрать, в снимок не попадают.
+        if dataset['valid']:
+            self._changed.add(entity_type)
+
+    @staticmethod
+    def _snapshot_rows(records):
+        if isinstance(records, SnapshotRecords):
+            return records.fields, records.rows
+        rows = [tuple(record.to_dict().values()) for record in records]
+        fields = tuple(records[0].to_dict()) if records else ()
+        return fields, rows
+
+    def save_snapshot(self):
+        if not self.snapshots:
+            return
+
+        import pickle
+
+        for entity_type in sorted(self._changed):
+            dataset = self._datasets[entity_type]
+            if dataset['signature'] is None:
+                continue
+
+            # Кортежи значений распаковываются в разы быстрее, чем объекты записей.
+            fields, rows = self._snapshot_rows(dataset['records'])
+            snapshot = {
+                'version': SNAPSHOT_VERSION,
+                'signature': dataset['signature'],
+                'fields': fields,
+                'rows': rows,
+                'columns': dataset['columns'],
+                'indexes': dataset['indexes'],
+                'sorted': dataset['sorted']
+            }
+            snapshot_file = self._snapshot_file(entity_type)
+            temp_file = snapshot_file + '.tmp'
+            try:
+                with open(temp_file, 'wb') as file:
+                    pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_file, snapshot_file)
+            except OSError as e:
+                print("Не удалось сохранить снимок данных:", e)
+        self._changed.clear()
+
+    def _load(self, entity_type):
+        filename, instance = self.sources[entity_type]
+        try:
+            stat = os.stat(filename)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = None
+
+        dataset = self._datasets.get(entity_type)
+        if dataset is None and signature is not None:
+            dataset = self._read_snapshot(entity_type)
+            if dataset is not None:
+                self._datasets[entity_type] = dataset
+
+        if dataset is None or dataset['signature'] != signature:
+            valid = True
+            try:
+                records = read_objects_from_json_file(filename, instance)
+            except FileNotFoundError:
+                records = []
+            except json.JSONDecodeError:
+                print(f"Ошибка: Неверный формат файла {filename}.")
+                records, valid = [], False
+
+            dataset = {
+                'signature': signature,
+                'valid': valid,
+                'records': records,
+                'columns': {},
+                'indexes': {},
+                'sorted': {}
+            }
+            self._datasets[entity_type] = dataset
+            self._mark_changed(entity_type, dataset)
+        return dataset
+
+    @staticmethod
+    def _field_values(records, field):
+        # Для записей из снимка значения берутся из кортежей, без создания объектов.
+        if isinstance(records, SnapshotRecords):
+            if field not in records.fields:
+                return [None] * len(records)
+            field_position = records.fields.index(field)
+            return [row[field_position] for row in records.rows]
+        return [getattr(record, field, None) for record in records]
+
+    @staticmethod
+    def _text_values(records):
+        if isinstance(records, SnapshotRecords):
+            return records.rows
+        return (record.to_dict().values() for record in records)
+
+    def _column(self, entity_type, dataset, field):
+        column = dataset['columns'].get(field)
+        if column is None:
+            if field == TEXT_COLUMN:
+                column = [' '.join(value.lower() for value in values if isinstance(value, str))
+                          for values in self._text_values(dataset['records'])]
+            else:
+                normalize = field_normalizer(field)
+                column = [normalize(value) for value in self._field_values(dataset['records'], field)]
+            dataset['columns'][field] = column
+            self._mark_changed(entity_type, dataset)
+        return column
+
+    def _index(self, entity_type, dataset, field):
+        index = dataset['indexes'].get(field)
+        if index is None:
+            index = {}
+            for position, value in enumerate(self._column(entity_type, dataset, field)):
+                index.setdefault(value, []).append(position)
+            dataset['indexes'][field] = index
+            self._mark_changed(entity_type, dataset)
+        return index
+
+    def _sorted_keys(self, entity_type, dataset, query):
+        sort_order = (query.sort_field, query.descending)
+        keys = dataset['sorted'].get(sort_order)
+        if keys is None:
+            columns = {field: self._column(entity_type, dataset, field) for field in ('id', query.sort_field) if field}
+            keys = sorted(query.sort_key(entity_type, position, columns) for position in range(len(dataset['records'])))
+            dataset['sorted'][sort_order] = keys
+            self._mark_changed(entity_type, dataset)
+        return keys
+
+    def _plan(self, entity_type, query):
+        """Возвращает описание плана и позиции записей-кандидатов (None — обход сортированного индекса)."""
+        dataset = self._load(entity_type)
+        best_field, best_positions = None, None
+        for field, op, expected in query.filters:
+            if field not in INDEXED_FIELDS.get(entity_type, ()):
+                continue
+            if op != '=' and not (op == ':' and field in NUMBER_FIELDS | BOOL_FIELDS):
+                continue
+            positions = self._index(entity_type, dataset, field).get(expected, [])
+            if best_positions is None or len(positions) < len(best_positions):
+                best_field, best_positions = field, positions
+
+        if best_field is None or len(best_positions) * INDEX_SELECTIVITY > len(dataset['records']):
+            return dataset, f"сортированный индекс по {query.sort_field or 'id'}", None
+        return dataset, f"индекс по {best_field} ({len(best_positions)} записей)", best_positions
+
+    def _rows(self, entity_type, query, after):
+        """Строки одного типа, идущие после ключа курсора, в порядке выдачи."""
+        import bisect
+
+        dataset, _, positions = self._plan(entity_type, query)
+        records = dataset['records']
+        columns = {field: self._column(entity_type, dataset, field) for field in query.fields()}
+
+        if positions is not None:
+            rows = [(query.sort_key(entity_type, position, columns), entity_type, records, position)
+                    for position in positions if query.matches(position, columns)]
+            if after is not None:
+                rows = [row for row in rows if (row[0] < after if query.descending else row[0] > after)]
+            rows.sort(key=lambda row: row[0], reverse=query.descending)
+            yield from rows
+            return
+
+        keys = self._sorted_keys(entity_type, dataset, query)
+        if query.descending:
+            end = len(keys) if after is None else bisect.bisect_left(keys, after)
+            order = range(end - 1, -1, -1)
+        else:
+            start = 0 if after is None else bisect.bisect_right(keys, after)
+            order = range(start, len(keys))
+        # Объекты записей создаются только для попавших на страницу строк.
+        for key_position in order:
+            key = keys[key_position]
+            if query.matches(key[-1], columns):
+                yield key, entity_type, records, key[-1]
+
+    def explain(self, text):
+        query = as_query(text)
+        return [f"{entity_type}: {self._plan(entity_type, query)[1]}" for entity_type in query.types]
+
+    def query(self, text, cursor=None, limit: int = QUERY_PAGE_SIZE):
+        import heapq
+        from itertools import islice
+
+        if limit < 1:
+            raise ValueError("размер страницы должен быть положительным")
+
+        query = as_query(text)
+        after = decode_cursor(query, cursor) if cursor else None
+        # Потоки каждого типа уже упорядочены, так что слияние читает только limit + 1 строк.
+        rows = heapq.merge(*(self._rows(entity_type, query, after) for entity_type in query.types),
+                           key=lambda row: row[0], reverse=query.descending)
+        page = list(islice(rows, limit + 1))
+
+        next_cursor = encode_cursor(query, page[limit - 1][0]) if len(page) > limit else None
+        items = [(entity_type, records[position]) for _, entity_type, records, position in page[:limit]]
+        return QueryPage(items, next_cursor)
+
+    def iter_pages(self, text, limit: int = QUERY_PAGE_SIZE):
+        query = as_query(text)
+        cursor = None
+        while True:
+            page = self.query(query, cursor, limit)
+            yield page
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+
 class PersonalAssistantApp:
-    def __init__(self):
-        self.note_manager = NoteManager(NOTES_FILE)
-        self.task_manager = TaskManager(TASKS_FILE)
-        self.contact_manager = ContactManager(CONTACTS_FILE)
-        self.finance_manager = FinanceManager(FINANCE_FILE)
+    # Менеджеры, файлы данных и движок запросов создаются при первом обращении.
+    def __init__(self, snapshots: bool = False):
+        self.snapshots = snapshots
+
+    @cached_property
+    def note_manager(self):
+        create_file_if_not_exist(NOTES_FILE)
+        return NoteManager(NOTES_FILE)
+
+    @cached_property
+    def task_manager(self):
+        create_file_if_not_exist(TASKS_FILE)
+        return TaskManager(TASKS_FILE)
+
+    @cached_property
+    def contact_manager(self):
+        create_file_if_not_exist(CONTACTS_FILE)
+        return ContactManager(CONTACTS_FILE)
+
+    @cached_property
+    def finance_manager(self):
+        create_file_if_not_exist(FINANCE_FILE)
+        return FinanceManager(FINANCE_FILE)
+
+    @cached_property
+    def query_engine(self):
+        return QueryEngine(snapshots=self.snapshots)
+
+    def save_snapshot(self):
+        if 'query_engine' in self.__dict__:
+            self.query_engine.save_snapshot()
+
+    def browse_records(self, text, empty_message="Записи не найдены."):
+        cursor = None
+        while True:
+            try:
+                page = self.query_engine.query(text, cursor)
+            except ValueError as e:
+                print("Ошибка в запросе:", e)
+                return
+
+            if not page.items and cursor is None:
+                print(empty_message)
+                return
+
+            for entity_type, record in page.items:
+                print(f"[{entity_type}] {record}")
+
+            if page.next_cursor is None:
+                return
+            if input("Enter — следующая страница, q — назад: ").strip().lower() == 'q':
+                return
+            cursor = page.next_cursor
 
     def main_menu(self):
         while True:
@@ -450,7 +1024,10 @@ class PersonalAssistantApp:
             print("3. Управление контактами")
             print("4. Управление финансовыми записями")
             print("5. Калькулятор")
-            print("6. Выход")
+            # Намеренное несовместимое изменение: выход перенесён с 6 на 7, чтобы остаться
+            # последним пунктом, как во всех меню. Сценарии, отвечавшие 6 для выхода, должны отвечать 7.
+            print("6. Поиск по всем записям")
+            print("7. Выход")
 
             choice = input("Ваш выбор: ")
 
@@ -465,6 +1042,8 @@ class PersonalAssistantApp:
             elif choice == '5':
                 self.calculator_menu()
             elif choice == '6':
+                self.search_menu()
+            elif choice == '7':
                 print("Выход из приложения.")
                 break
             else:
@@ -490,7 +1069,7 @@ class PersonalAssistantApp:
                 self.note_manager.add_note(title, content)
 
             elif choice == '2':
-                self.note_manager.view_notes()
+                self.browse_records('type:note', "Нет доступных заметок.")
 
             elif choice == '3':
                 note_id = int(input("Введите ID заметки для просмотра: "))
@@ -539,7 +1118,7 @@ class PersonalAssistantApp:
                 due_date = input("Введите срок выполнения (ДД-ММ-ГГГГ): ")
                 self.task_manager.add_task(title, description, priority, due_date)
             elif choice == '2':
-                self.task_manager.view_tasks()
+                self.browse_records('type:task', "Нет доступных задач.")
             elif choice == '3':
                 task_id = int(input("Введите ID задачи для отметки как выполненной: "))
                 self.task_manager.mark_task_as_done(task_id)
@@ -583,7 +1162,8 @@ class PersonalAssistantApp:
 
             elif choice == '2':
                 query = input("Введите имя или номер телефона для поиска: ")
-                self.contact_manager.search_contact(query)
+                # Ввод ищется дословно, а не разбирается как язык запросов.
+                self.browse_records(Query(['contact'], [], [query.lower()]), "Контакты не найдены.")
 
             elif choice == '3':
                 contact_id = int(input("Введите ID контакта для редактирования: "))
@@ -629,7 +1209,7 @@ class PersonalAssistantApp:
                 self.finance_manager.add_record(amount, category, date, description)
 
             elif choice == '2':
-                self.finance_manager.view_records()
+                self.browse_records('type:finance', "Нет доступных финансовых записей.")
 
             elif choice == '3':
                 start_date = input("Введите начальную дату (ДД-ММ-ГГГГ): ")
@@ -648,6 +1228,13 @@ class PersonalAssistantApp:
             else:
                 print("Некорректный ввод. Пожалуйста, выберите действие из меню.")
 
+    def search_menu(self):
+        print("\nПоиск по всем записям.")
+        print("Пример запроса: type:task done:false due<01-12-2026 sort:due")
+        print("Типы: note, task, contact, finance. Операторы: : = != < <= > >=, sort:поле или sort:-поле.")
+        text = input("Введите запрос: ")
+        self.browse_records(text)
+
     def calculator_menu(self):
         while True:
             print("\nКалькулятор:")
@@ -676,6 +1263,8 @@ class PersonalAssistantApp:
 
 
 if __name__ == "__main__":
-    create_files_if_not_exist()
-    app = PersonalAssistantApp()
-    app.main_menu()
+    app = PersonalAssistantApp(snapshots=os.environ.get(SNAPSHOTS_ENV) == '1')
+    try:
+        app.main_menu()
+    finally:
+        app.save_snapshot()
@@ -0,0 +1,305 @@
+import base64
+import json
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from personal_assistant import SNAPSHOT_SUFFIX, PersonalAssistantApp, Query, QueryEngine, Note, Task, Contact, FinanceRecord
+
+
+@pytest.fixture
+def engine(tmp_path):
+    datasets = {
+        'note': ('notes.json', Note, [
+            {'id': i, 'title': f'Заметка {i}', 'content': 'молоко' if i % 4 == 0 else 'хлеб',
+             'timestamp': f'{i % 28 + 1:02d}-01-2026 12:00:00'}
+            for i in range(1, 31)
+        ]),
+        'task': ('tasks.json', Task, [
+            {'id': i, 'title': f'Задача {i}', 'description': 'Описание', 'done': i % 3 == 0,
+             'priority': 'Высокий' if i % 2 else 'Низкий', 'due_date': f'{i % 28 + 1:02d}-{i % 12 + 1:02d}-2026'}
+            for i in range(1, 61)
+        ]),
+        'contact': ('contacts.json', Contact, [
+            {'id': i, 'name': f'Контакт {i}', 'phone': f'+7900{i:07d}', 'email': f'user{i}@example.com'}
+            for i in range(1, 21)
+        ]),
+        'finance': ('finance.json', FinanceRecord, [
+            {'id': i, 'amount': (i % 7) * 10.0 - 30, 'category': 'Еда' if i % 2 else 'Транспорт',
+             'date': f'{i % 28 + 1:02d}-06-2026', 'description': 'Покупка'}
+            for i in range(1, 41)
+        ])
+    }
+
+    sources = {}
+    for entity_type, (file_name, instance, content) in datasets.items():
+        path = tmp_path / file_name
+        path.write_text(json.dumps(content, ensure_ascii=False), encoding='utf-8')
+        sources[entity_type] = (str(path), instance)
+    return QueryEngine(sources)
+
+
+def collect_pages(engine, text, limit):
+    return [(entity_type, record.id) for page in engine.iter_pages(text, limit)
+            for entity_type, record in page.items]
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    'sort:due',
+    'sort:-due',
+    'sort:amount',
+    'sort:-id',
+    'type:task done:false sort:-priority',
+    'type:note,finance sort:-date',
+    'type:task,note,finance id=7 sort:-id',
+    'молоко sort:-timestamp'
+])
+def test_pages_match_single_page(engine, text):
+    expected = [(entity_type, record.id) for entity_type, record in engine.query(text, limit=1000).items]
+
+    assert expected
+    assert collect_pages(engine, text, 7) == expected
+    assert collect_pages(engine, text, 1) == expected
+
+
+def test_descending_is_reverse_of_ascending(engine):
+    ascending = collect_pages(engine, 'type:task sort:id', 5)
+    descending = collect_pages(engine, 'type:task sort:-id', 5)
+
+    assert descending == ascending[::-1]
+
+
+def test_due_before_date(engine):
+    items = engine.query('type:task done:false due<01-06-2026 sort:due', limit=1000).items
+    due_dates = [(int(task.due_date[6:]), int(task.due_date[3:5]), int(task.due_date[:2])) for _, task in items]
+
+    assert items
+    assert all(not task.done for _, task in items)
+    assert all(due_date < (2026, 6, 1) for due_date in due_dates)
+    assert due_dates == sorted(due_dates)
+
+
+def test_colon_is_substring_for_text_and_equality_for_numbers(engine):
+    contacts = engine.query('type:contact name:контакт', limit=1000).items
+    by_id = engine.query('type:contact id:7', limit=1000).items
+
+    assert len(contacts) == 20
+    assert [contact.id for _, contact in by_id] == [7]
+
+
+def test_not_equal(engine):
+    items = engine.query('type:finance category!=еда', limit=1000).items
+
+    assert len(items) == 20
+    assert all(record.category == 'Транспорт' for _, record in items)
+
+
+def test_type_filter(engine):
+    items = engine.query('type:note,contact', limit=1000).items
+
+    assert {entity_type for entity_type, _ in items} == {'note', 'contact'}
+    assert len(items) == 50
+
+
+def test_words_search_text_fields(engine):
+    items = engine.query('молоко', limit=1000).items
+
+    assert [(entity_type, note.id) for entity_type, note in items] == [('note', i) for i in range(4, 31, 4)]
+
+
+def test_plan_uses_selective_equality_index_or_sorted_index(engine):
+    assert engine.explain('type:task id:7') == ['task: индекс по id (1 записей)']
+    assert engine.explain('type:task done:true') == ['task: сортированный индекс по id']
+    assert engine.explain('type:task title:задача sort:due') == ['task: сортированный индекс по due_date']
+
+
+def test_next_page_seeks_from_cursor(engine, monkeypatch):
+    first = engine.query('type:task sort:due', limit=5)
+    checked = []
+    matches = Query.matches
+    monkeypatch.setattr(Query, 'matches', lambda self, position, columns: (
+        checked.append(position) or matches(self, position, columns)))
+
+    engine.query('type:task sort:due', cursor=first.next_cursor, limit=5)
+
+    assert len(checked) == 6
+
+
+@pytest.mark.parametrize('text', [
+    'type:unknown',
+    'due<31-02-2026',
+    'done:maybe',
+    'amount>много',
+    'title:"незакрытая'
+])
+def test_bad_query_raises_value_error(engine, text):
+    with pytest.raises(ValueError):
+        engine.query(text)
+
+
+def make_cursor(sort, after):
+    payload = json.dumps({'sort': sort, 'after': after})
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+@pytest.mark.parametrize('cursor', [
+    'не курсор',
+    '!!!',
+    make_cursor([None, False], [[1], 2, 3, 4, 5]),
+    make_cursor([None, False], [0, 'x', 'note', 1, 0]),
+    make_cursor([None, False], [0, '', 'unknown', 1, 0]),
+    make_cursor([None, False], [0, '', 'note', 1]),
+    make_cursor(['id', False], [0, '', 'note', 1, 0]),
+    make_cursor(['due_date', True], [0, '', 'note', 1, 0])
+])
+def test_bad_cursor_raises_value_error(engine, cursor):
+    with pytest.raises(ValueError):
+        engine.query('sort:id', cursor=cursor)
+
+
+def test_limit_must_be_positive(engine):
+    with pytest.raises(ValueError):
+        engine.query('', limit=0)
+
+
+def test_snapshot_is_reused_until_file_changes(engine):
+    engine.snapshots = True
+    expected = collect_pages(engine, 'type:task done:false sort:due', 10)
+    engine.save_snapshot()
+
+    warm = QueryEngine(engine.sources, snapshots=True)
+    assert collect_pages(warm, 'type:task done:false sort:due', 10) == expected
+    assert type(warm._datasets['task']['records']).__name__ == 'SnapshotRecords'
+
+    filename, _ = engine.sources['task']
+    with open(filename, 'w', encoding='utf-8') as file:
+        json.dump([], file)
+    assert QueryEngine(engine.sources, snapshots=True).query('type:task').items == []
+
+
+def test_snapshot_columns_do_not_materialize_records(engine):
+    engine.snapshots = True
+    engine.query('type:note')
+    engine.save_snapshot()
+
+    warm = QueryEngine(engine.sources, snapshots=True)
+    items = warm.query('type:note молоко sort:-timestamp', limit=2).items
+    records = warm._datasets['note']['records']
+
+    assert len(items) == 2
+    assert sum(record is not None for record in records._records) == 2
+
+
+def test_corrupt_file_is_not_snapshotted(engine, capsys):
+    filename, _ = engine.sources['note']
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.write('[{"id": 1,')
+    engine.snapshots = True
+
+    assert engine.query('type:note молоко').items == []
+    engine.save_snapshot()
+
+    assert not os.path.exists(filename + SNAPSHOT_SUFFIX)
+    assert 'Неверный формат' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('search, expected', [
+    ("o'brien", [21]),
+    ('type:note', [22]),
+    ('id<5', []),
+    ('+79000000015', [15])
+])
+def test_literal_search_words_skip_query_parser(engine, search, expected):
+    filename, _ = engine.sources['contact']
+    with open(filename, encoding='utf-8') as file:
+        contacts = json.load(file)
+    contacts.append({'id': 21, 'name': "O'Brien", 'phone': '+1', 'email': 'ob@example.com'})
+    contacts.append({'id': 22, 'name': 'type:note', 'phone': '+2', 'email': 'tn@example.com'})
+    with open(filename, 'w', encoding='utf-8') as file:
+        json.dump(contacts, file)
+
+    items = engine.query(Query(['contact'], [], [search])).items
+
+    assert [(entity_type, contact.id) for entity_type, contact in items] == [('contact', i) for i in expected]
+
+
+@pytest.mark.parametrize('text, keep', [
+    ('timestamp=05-01-2026', lambda day: day == 5),
+    ('timestamp:05-01-2026', lambda day: day == 5),
+    ('timestamp!=05-01-2026', lambda day: day != 5),
+    ('timestamp<=05-01-2026', lambda day: day <= 5),
+    ('timestamp<05-01-2026', lambda day: day < 5),
+    ('timestamp>05-01-2026', lambda day: day > 5),
+    ('timestamp>=05-01-2026', lambda day: day >= 5),
+    ('"timestamp<05-01-2026 12:00:01"', lambda day: day <= 5),
+    ('"timestamp>05-01-2026 12:00:01"', lambda day: day > 5)
+])
+def test_date_only_bounds_compare_whole_days(engine, text, keep):
+    # У всех заметок время 12:00:00, а день в месяце равен id % 28 + 1.
+    items = engine.query(f'type:note {text}', limit=1000).items
+
+    assert [note.id for _, note in items] == [i for i in range(1, 31) if keep(i % 28 + 1)]
+
+
+@pytest.mark.parametrize('damage', [
+    lambda snapshot: snapshot.pop('signature'),
+    lambda snapshot: snapshot.pop('fields'),
+    lambda snapshot: snapshot.pop('rows'),
+    lambda snapshot: snapshot.pop('columns'),
+    lambda snapshot: snapshot.pop('indexes'),
+    lambda snapshot: snapshot.pop('sorted'),
+    lambda snapshot: snapshot['rows'].pop(),
+    lambda snapshot: snapshot['columns']['id'].pop(),
+    lambda snapshot: snapshot['indexes']['done'][0].append(1000),
+    lambda snapshot: snapshot['sorted'][(None, False)].pop(),
+    lambda snapshot: snapshot.update(version=1)
+])
+def test_incomplete_snapshot_falls_back_to_json(engine, damage):
+    engine.snapshots = True
+    expected = collect_pages(engine, 'type:task done:false', 10)
+    engine.save_snapshot()
+
+    filename, _ = engine.sources['task']
+    with open(filename + SNAPSHOT_SUFFIX, 'rb') as file:
+        snapshot = pickle.load(file)
+    damage(snapshot)
+    with open(filename + SNAPSHOT_SUFFIX, 'wb') as file:
+        pickle.dump(snapshot, file)
+
+    warm = QueryEngine(engine.sources, snapshots=True)
+    assert collect_pages(warm, 'type:task done:false', 10) == expected
+    assert isinstance(warm._datasets['task']['records'], list)
+
+
+def test_app_creates_no_files_until_manager_is_used(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    app = PersonalAssistantApp()
+    assert os.listdir(tmp_path) == []
+
+    app.task_manager
+    assert os.listdir(tmp_path) == ['tasks.json']
+
+
+def test_app_list_without_snapshots_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    app = PersonalAssistantApp()
+
+    assert app.query_engine.query('type:note').items == []
+    app.save_snapshot()
+    assert os.listdir(tmp_path) == []
+
+
+def test_import_defers_optional_modules(tmp_path):
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    code = ('import sys; import personal_assistant; '
+            'print(sorted(name for name in ("csv", "datetime", "pickle") if name in sys.modules))')
+    python_path = os.pathsep.join(filter(None, [module_dir, os.environ.get('PYTHONPATH')]))
+    output = subprocess.run([sys.executable, '-c', code], cwd=tmp_path, capture_output=True, text=True, check=True,
+                            env={**os.environ, 'PYTHONPATH': python_path}).stdout
+
+    assert output.strip() == '[]'